@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2019-2023 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+# backup: Easily configure and reproducibly run complex backups.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import re
+import unittest
+
+from subprocess import Popen, PIPE
+
+
+class IncludeTests(unittest.TestCase):
+    def test_is_valid(self):
+        p = Popen(
+            ["./backup", "--is-valid", "./tests/includes-invalid.xml"],
+            stdout=PIPE,
+            stderr=PIPE,
+            encoding="utf8",
+        )
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 1)
+        self.assertEqual(stdout, "")
+        self.assertIsNotNone(
+            re.fullmatch(
+                r"\[CRITICAL\] XML file tests/invalid\.xml is not valid\.\n\[CRITICAL\] "
+                + r".+?/invalid\.xml:9:0:ERROR:SCHEMASV:SCHEMAV_ELEMENT_CONTENT: Element "
+                + r"'{https://github\.com/jnphilipp/backup/}exclude': This element is not "
+                + r"expected\. Expected is \( {https://github\.com/jnphilipp/backup/}path "
+                + r"\)\.\n\[CRITICAL\] XML file tests/missing\.xml is not valid\.\n"
+                + r"\[CRITICAL\] Error reading file '.+?/missing\.xml': .+\n",
+                stderr,
+            )
+        )
+
+    def test_disabled(self):
+        p = Popen(
+            ["./backup", "--dry-run", "-v", "-d", "./tests/mixed.xml", "./BACKUPS"],
+            stdout=PIPE,
+            stderr=PIPE,
+            encoding="utf8",
+        )
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 0)
+        self.assertIsNotNone(
+            re.fullmatch(
+                r"Using '[^\']+/BACKUPS' as backup target\.\nBacking up source /boot\.\n"
+                + r"Backing up source /srv\.\nDry run done\.\n",
+                stdout,
+            )
+        )
+        self.assertEqual(
+            "[WARNING] Performing dry run, no changes will be done.\n[WARNING] The "
+            + "given target path does not exists.\n",
+            stderr,
+        )
+
+        p = Popen(
+            ["./backup", "--dry-run", "-d", "./tests/databases.xml", "./BACKUPS"],
+            stdout=PIPE,
+            stderr=PIPE,
+            encoding="utf8",
+        )
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 1)
+        self.assertEqual(stdout, "")
+        self.assertIsNotNone(
+            re.fullmatch(
+                r"\[WARNING\] Performing dry run, no changes will be done\.\n\[WARNING\] "
+                + r"The given target path does not exists\.\n\[CRITICAL\] XML file "
+                + r"tests/missing\.xml is not valid\.\n\[CRITICAL\] Error reading file "
+                + r"'.+?/missing\.xml': .+\n",
+                stderr,
+            )
+        )
+
+    def test_only(self):
+        p = Popen(
+            [
+                "./backup",
+                "--dry-run",
+                "-v",
+                "--only",
+                "/etc",
+                "--only",
+                "/run/media/DATA",
+                "./tests/tar.xml",
+                "./BACKUPS",
+            ],
+            stdout=PIPE,
+            stderr=PIPE,
+            encoding="utf8",
+        )
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 0)
+        self.assertIsNotNone(
+            re.fullmatch(
+                r"Using '[^\']+/BACKUPS' as backup target\.\nBacking up source /etc\.\n"
+                + r"Backing up source /run/media/DATA\.\nDry run done\.\n",
+                stdout,
+            )
+        )
+
+        p = Popen(
+            [
+                "./backup",
+                "--dry-run",
+                "--only",
+                "/run/media/DATA",
+                "./tests/includes-invalid.xml",
+                "./BACKUPS",
+            ],
+            stdout=PIPE,
+            stderr=PIPE,
+            encoding="utf8",
+        )
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 1)
+        self.assertEqual(stdout, "")
+        self.assertIsNotNone(
+            re.fullmatch(
+                r"\[WARNING\] Performing dry run, no changes will be done\.\n\[WARNING\] "
+                + r"The given target path does not exists\.\n\[CRITICAL\] XML file "
+                + r"tests/missing\.xml is not valid\.\n\[CRITICAL\] Error reading file "
+                + r"'.+?/missing\.xml': .+\n",
+                stderr,
+            )
+        )
+
+        p = Popen(
+            [
+                "./backup",
+                "--dry-run",
+                "-v",
+                "--only",
+                "/srv",
+                "--only",
+                "/nothing",
+                "./tests/nested.xml",
+                "./BACKUPS",
+            ],
+            stdout=PIPE,
+            stderr=PIPE,
+            encoding="utf8",
+        )
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 0)
+        self.assertIsNotNone(
+            re.fullmatch(
+                r"Using '[^\']+/BACKUPS' as backup target\.\nBacking up source /srv\.\n"
+                + r"Dry run done\.\n",
+                stdout,
+            )
+        )
+        self.assertEqual(
+            "[WARNING] Performing dry run, no changes will be done.\n[WARNING] The "
+            + "given target path does not exists.\n[WARNING] No source or database "
+            + "matches /nothing.\n",
+            stderr,
+        )
+
+    def test_cycle(self):
+        p = Popen(
+            ["./backup", "--dry-run", "-v", "./tests/nested.xml", "./BACKUPS"],
+            stdout=PIPE,
+            stderr=PIPE,
+            encoding="utf8",
+        )
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 0)
+        self.assertIsNotNone(
+            re.fullmatch(
+                r"Using '[^\']+/BACKUPS' as backup target\.\nBacking up source /boot\.\n"
+                + r"Backing up source /etc\.\nBacking up source /srv\.\nDry run done\.\n",
+                stdout,
+            )
+        )
+        self.assertEqual(
+            "[WARNING] Performing dry run, no changes will be done.\n[WARNING] The "
+            + "given target path does not exists.\n",
+            stderr,
+        )
+
+        p = Popen(
+            ["./backup", "--is-valid", "-v", "./tests/nested.xml"],
+            stdout=PIPE,
+            stderr=PIPE,
+            encoding="utf8",
+        )
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 0)
+        self.assertEqual(stdout, "XML file ./tests/nested.xml is valid.\n")
+        self.assertEqual(stderr, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2019-2023 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+# backup: Easily configure and reproducibly run complex backups.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import re
+import unittest
+
+from pathlib import Path
+from subprocess import Popen, PIPE
+from tempfile import TemporaryDirectory
+
+
+class PlanTests(unittest.TestCase):
+    def setUp(self):
+        self.target = TemporaryDirectory()
+        with open(Path(self.target.name) / "backup-history.json", "w") as f:
+            json.dump(
+                {
+                    "laptop/files/boot": [
+                        {"timestamp": 0, "seconds": 10, "bytes": 1000}
+                    ],
+                    "laptop/files/etc": [
+                        {"timestamp": 0, "seconds": 50, "bytes": 1024},
+                        {"timestamp": 1, "seconds": 70, "bytes": 3072},
+                    ],
+                    "laptop/files/srv": [{"timestamp": 0, "seconds": 3600, "bytes": 0}],
+                    "server/db-dumps/PostgreSQL/db": [
+                        {"timestamp": 0, "seconds": 30, "bytes": 500}
+                    ],
+                },
+                f,
+            )
+
+    def tearDown(self):
+        self.target.cleanup()
+
+    def test_plan(self):
+        p = Popen(
+            ["./backup", "--plan", "-v", "./tests/plan.xml", self.target.name],
+            stdout=PIPE,
+            stderr=PIPE,
+            encoding="utf8",
+        )
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 0)
+        self.assertIsNotNone(
+            re.fullmatch(
+                r"Using '[^\']+' as backup target\.\n"
+                + r"Forecast for source /boot: 1000 B in 0:00:10, source size \d+(\.\d)? \w+\.\n"
+                + r"Forecast for source /etc: 2\.0 KiB in 0:01:00, source size \d+(\.\d)? \w+\.\n"
+                + r"Forecast for source /srv: 0 B in 1:00:00, source size \d+(\.\d)? \w+\.\n"
+                + r"Forecast for PostgreSQL database db from server: 500 B in 0:00:30\.\n"
+                + r"Forecast for sources: 3\.0 KiB in 1:01:10\.\n"
+                + r"Forecast for databases: 500 B in 0:00:30\.\n"
+                + r"Forecast for total: 3\.5 KiB in 1:01:40\.\n",
+                stdout,
+            )
+        )
+        self.assertEqual(stderr, "")
+        self.assertEqual(
+            [p.name for p in Path(self.target.name).iterdir()], ["backup-history.json"]
+        )
+
+    def test_plan_jobs(self):
+        p = Popen(
+            [
+                "./backup",
+                "--plan",
+                "-v",
+                "--time-window",
+                "61m",
+                "-j",
+                "2",
+                "./tests/plan.xml",
+                self.target.name,
+            ],
+            stdout=PIPE,
+            stderr=PIPE,
+            encoding="utf8",
+        )
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 0)
+        self.assertIsNotNone(
+            re.search(
+                r"Forecast for sources: 3\.0 KiB in 1:00:10\.\n"
+                + r"Forecast for databases: 500 B in 0:00:30\.\n"
+                + r"Forecast for total: 3\.5 KiB in 1:00:40\.\n$",
+                stdout,
+            )
+        )
+        self.assertEqual(stderr, "")
+
+        p = Popen(
+            [
+                "./backup",
+                "--plan",
+                "--time-window",
+                "61m",
+                "./tests/plan.xml",
+                self.target.name,
+            ],
+            stdout=PIPE,
+            stderr=PIPE,
+            encoding="utf8",
+        )
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 1)
+        self.assertEqual(
+            stderr,
+            "[CRITICAL] The run takes 1:01:40, but the time window is only 1:01:00.\n",
+        )
+
+    def test_time_window(self):
+        p = Popen(
+            [
+                "./backup",
+                "--plan",
+                "--time-window",
+                "10m",
+                "./tests/plan.xml",
+                self.target.name,
+            ],
+            stdout=PIPE,
+            stderr=PIPE,
+            encoding="utf8",
+        )
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 1)
+        self.assertEqual(stdout, "")
+        self.assertEqual(
+            stderr,
+            "[CRITICAL] The run takes 1:01:40, but the time window is only 0:10:00.\n",
+        )
+
+        p = Popen(
+            [
+                "./backup",
+                "--plan",
+                "--time-window",
+                "10m",
+                "--skip-low-priority",
+                "./tests/plan.xml",
+                self.target.name,
+            ],
+            stdout=PIPE,
+            stderr=PIPE,
+            encoding="utf8",
+        )
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 0)
+        self.assertEqual(stdout, "")
+        self.assertEqual(
+            stderr, "[WARNING] Skipping source /srv, the run does not fit otherwise.\n"
+        )
+
+        p = Popen(
+            [
+                "./backup",
+                "--dry-run",
+                "--preflight",
+                "--time-window",
+                "10m",
+                "./tests/plan.xml",
+                self.target.name,
+            ],
+            stdout=PIPE,
+            stderr=PIPE,
+            encoding="utf8",
+        )
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 1)
+        self.assertEqual(stdout, "")
+        self.assertEqual(
+            stderr,
+            "[WARNING] Performing dry run, no changes will be done.\n[CRITICAL] The "
+            + "run takes 1:01:40, but the time window is only 0:10:00.\n[CRITICAL] The "
+            + "run does not fit, refusing to start.\n",
+        )
+
+    def test_skip_low_priority(self):
+        p = Popen(
+            [
+                "./backup",
+                "--plan",
+                "--time-window",
+                "5s",
+                "--skip-low-priority",
+                "./tests/plan.xml",
+                self.target.name,
+            ],
+            stdout=PIPE,
+            stderr=PIPE,
+            encoding="utf8",
+        )
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 1)
+        self.assertEqual(stdout, "")
+        self.assertEqual(
+            stderr,
+            "[WARNING] Cannot skip any of the remaining jobs, they have the highest "
+            + "priority 1.\n[WARNING] Skipping source /srv, the run does not fit "
+            + "otherwise.\n[WARNING] Skipping PostgreSQL database db from server, the "
+            + "run does not fit otherwise.\n[WARNING] Skipping source /etc, the run "
+            + "does not fit otherwise.\n[CRITICAL] The run takes 0:00:10, but the time "
+            + "window is only 0:00:05.\n",
+        )
+
+        p = Popen(
+            [
+                "./backup",
+                "--plan",
+                "--time-window",
+                "10m",
+                "--skip-low-priority",
+                "./tests/skip.xml",
+                self.target.name,
+            ],
+            stdout=PIPE,
+            stderr=PIPE,
+            encoding="utf8",
+        )
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 0)
+        self.assertEqual(stdout, "")
+        self.assertEqual(
+            stderr, "[WARNING] Skipping source /srv, the run does not fit otherwise.\n"
+        )
+
+        p = Popen(
+            [
+                "./backup",
+                "--plan",
+                "--time-window",
+                "5s",
+                "--skip-low-priority",
+                "./tests/skip.xml",
+                self.target.name,
+            ],
+            stdout=PIPE,
+            stderr=PIPE,
+            encoding="utf8",
+        )
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 1)
+        self.assertEqual(stdout, "")
+        self.assertEqual(
+            stderr,
+            "[WARNING] Cannot skip source /boot, nothing would be left to run.\n"
+            + "[WARNING] Skipping source /srv, the run does not fit otherwise.\n"
+            + "[WARNING] Skipping source /etc, the run does not fit otherwise.\n"
+            + "[CRITICAL] The run takes 0:00:10, but the time window is only 0:00:05.\n",
+        )
+
+    def test_order(self):
+        with open(Path(self.target.name) / "backup-history.json", "w") as f:
+            json.dump(
+                {
+                    "laptop/files/boot": [{"timestamp": 0, "seconds": 10, "bytes": 0}],
+                    "laptop/files/etc": [{"timestamp": 0, "seconds": 60, "bytes": 0}],
+                    "server1/files/srv": [
+                        {"timestamp": 0, "seconds": 3600, "bytes": 0}
+                    ],
+                    "server1/files/home": [
+                        {"timestamp": 0, "seconds": 1800, "bytes": 0}
+                    ],
+                    "server2/files/var": [{"timestamp": 0, "seconds": 100, "bytes": 0}],
+                },
+                f,
+            )
+
+        p = Popen(
+            [
+                "./backup",
+                "--dry-run",
+                "-v",
+                "--order",
+                "longest-first",
+                "./tests/order.xml",
+                self.target.name,
+            ],
+            stdout=PIPE,
+            stderr=PIPE,
+            encoding="utf8",
+        )
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 0)
+        self.assertIsNotNone(
+            re.fullmatch(
+                r"Using '[^\']+' as backup target\.\n"
+                + r"Planned source /etc, taking 0:01:00, finishing at \d\d:\d\d:\d\d\.\n"
+                + r"Planned source /srv mounted from user@server1, taking 1:00:00, "
+                + r"finishing at \d\d:\d\d:\d\d\.\n"
+                + r"Planned source /home mounted from user@server1, taking 0:30:00, "
+                + r"finishing at \d\d:\d\d:\d\d\.\n"
+                + r"Planned source /var mounted from user@server2, taking 0:01:40, "
+                + r"finishing at \d\d:\d\d:\d\d\.\n"
+                + r"Planned source /boot, taking 0:00:10, finishing at \d\d:\d\d:\d\d\.\n"
+                + r"Backing up source /etc\.\n"
+                + r"Backing up source /srv mounted from user@server1\.\n"
+                + r"Backing up source /home mounted from user@server1\.\n"
+                + r"Backing up source /var mounted from user@server2\.\n"
+                + r"Backing up source /boot\.\n"
+                + r"Dry run done\.\n",
+                stdout,
+            )
+        )
+        self.assertEqual(
+            stderr, "[WARNING] Performing dry run, no changes will be done.\n"
+        )
+
+        p = Popen(
+            [
+                "./backup",
+                "--dry-run",
+                "-v",
+                "--order",
+                "longest-first",
+                "--interleave-hosts",
+                "-j",
+                "2",
+                "./tests/order.xml",
+                self.target.name,
+            ],
+            stdout=PIPE,
+            stderr=PIPE,
+            encoding="utf8",
+        )
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 0)
+        self.assertIsNotNone(
+            re.fullmatch(
+                r"Using '[^\']+' as backup target\.\n"
+                + r"Planned source /etc on worker 1, taking 0:01:00, finishing at "
+                + r"\d\d:\d\d:\d\d\.\n"
+                + r"Planned source /srv mounted from user@server1 on worker 2, taking "
+                + r"1:00:00, finishing at \d\d:\d\d:\d\d\.\n"
+                + r"Planned source /var mounted from user@server2 on worker 1, taking "
+                + r"0:01:40, finishing at \d\d:\d\d:\d\d\.\n"
+                + r"Planned source /home mounted from user@server1 on worker 1, taking "
+                + r"0:30:00, finishing at \d\d:\d\d:\d\d\.\n"
+                + r"Planned source /boot on worker 1, taking 0:00:10, finishing at "
+                + r"\d\d:\d\d:\d\d\.\n"
+                + r"Backing up source /etc\.\n"
+                + r"Backing up source /srv mounted from user@server1\.\n"
+                + r"Backing up source /var mounted from user@server2\.\n"
+                + r"Backing up source /home mounted from user@server1\.\n"
+                + r"Backing up source /boot\.\n"
+                + r"Dry run done\.\n",
+                stdout,
+            )
+        )
+        self.assertEqual(
+            stderr, "[WARNING] Performing dry run, no changes will be done.\n"
+        )
+
+    def test_order_priority(self):
+        with open(Path(self.target.name) / "backup-history.json", "w") as f:
+            json.dump(
+                {"server1/files/srv": [{"timestamp": 0, "seconds": 3600, "bytes": 0}]},
+                f,
+            )
+
+        p = Popen(
+            [
+                "./backup",
+                "--dry-run",
+                "-v",
+                "--order",
+                "priority",
+                "--interleave-hosts",
+                "./tests/order-priority.xml",
+                self.target.name,
+            ],
+            stdout=PIPE,
+            stderr=PIPE,
+            encoding="utf8",
+        )
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 0)
+        self.assertIsNotNone(
+            re.fullmatch(
+                r"Using '[^\']+' as backup target\.\n"
+                + r"Planned source /srv mounted from user@server1, taking 1:00:00, "
+                + r"finishing at \d\d:\d\d:\d\d\.\n"
+                + r"Planned source /home mounted from user@server1, taking n/a, "
+                + r"finishing at n/a\.\n"
+                + r"Planned source /var mounted from user@server2, taking n/a, "
+                + r"finishing at n/a\.\n"
+                + r"Backing up source /srv mounted from user@server1\.\n"
+                + r"Backing up source /home mounted from user@server1\.\n"
+                + r"Backing up source /var mounted from user@server2\.\n"
+                + r"Dry run done\.\n",
+                stdout,
+            )
+        )
+        self.assertEqual(
+            stderr, "[WARNING] Performing dry run, no changes will be done.\n"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -131,7 +131,7 @@ class RsyncBackupTests(unittest.TestCase):
         self.assertEqual(p.returncode, 0)
         self.assertIsNotNone(
             re.fullmatch(
-                r"Using '[^\']+/BACKUPS' as backup target\.\nLoading XML file \"\./tests/rsync\.xml\"\.\nLoading XML schema \".*?backup\.xsd\"\.\nXML file \./tests/rsync\.xml is valid\.\nParsing XML element <Element {https://github\.com/jnphilipp/backup/}source at 0x[\w\d]+> for source\.\nParsing XML element <Element {https://github\.com/jnphilipp/backup/}source at 0x[\w\d]+> for source\.\nParsing XML element <Element {https://github\.com/jnphilipp/backup/}source at 0x[\w\d]+> for source\.\nParsing XML element <Element {https://github\.com/jnphilipp/backup/}source at 0x[\w\d]+> for source\.\nParsing XML element <Element {https://github\.com/jnphilipp/backup/}source at 0x[\w\d]+> for source\.\nLoading XML file \"tests/data\.xml\"\.\nLoading XML schema \".*?backup\.xsd\"\.\nXML file tests/data\.xml is valid\.\nParsing XML element <Element {https://github\.com/jnphilipp/backup/}source at 0x[\w\d]+> for source\.\nBacking up source /boot\.\nCommand: \"rsync\" \"--delete\" \"--delete-excluded\" \"--stats\" \"--backup-dir=.+?/BACKUPS/.+?/backup/boot\" \"-abuchvz\" \"/boot/\" \".+?/BACKUPS/.+?/files/boot\"\nEnv: None\nCwd: None\nBacking up source /etc\.\nCommand: \"rsync\" \"--delete\" \"--delete-excluded\" \"--stats\" \"--backup-dir=.+?/BACKUPS/.+?/backup/etc\" \"-abuchvz\" \"/etc/\" \".+?/BACKUPS/.+?/files/etc\"\nEnv: None\nCwd: None\nBacking up source /root\.\nCommand: \"rsync\" \"--delete\" \"--delete-excluded\" \"--stats\" \"--backup-dir=.+?/BACKUPS/.+?/backup/root\" \"-abuchvz\" \"--exclude=\*\*/\.cache\" \"--exclude=\*\*/\.dbus\" \"--exclude=\*\*/\.gvfs\" \"/root/\" \".+?/BACKUPS/.+?/files/root\"\nEnv: None\nCwd: None\nBacking up source /var\.\nCommand: \"rsync\" \"--delete\" \"--delete-excluded\" \"--stats\" \"--backup-dir=.+?/BACKUPS/.+?/backup/var\" \"-abuchvz\" \"--exclude=/crash\" \"--exclude=/tmp\" \"--exclude=/log\" \"--exclude=/spool\" \"/var/\" \".+?/BACKUPS/.+?/files/var\"\nEnv: None\nCwd: None\nBacking up source /srv\.\nCommand: \"rsync\" \"--delete\" \"--delete-excluded\" \"--stats\" \"--backup-dir=.+?/BACKUPS/.+?/backup/srv\" \"-abuchvz\" \"--exclude=\*\*/venv\" \"--exclude=\*\*/\.venv\" \"--exclude=\*\*/__pycache__\" \"--exclude=\*\*/\.mypy_cache\" \"/srv/\" \".+?/BACKUPS/.+?/files/srv\"\nEnv: None\nCwd: None\nBacking up source /run/media/DATA\.\nCommand: \"rsync\" \"--delete\" \"--delete-excluded\" \"--stats\" \"--backup-dir=.+?/BACKUPS/.+?/backup/run/media/DATA\" \"-abuchvz\" \"--exclude=/.Trash-1000\" \"/run/media/DATA/\" \".+?/BACKUPS/.+?/files/run/media/DATA\"\nEnv: None\nCwd: None\nDry run done\.\n",
+                r"Using '[^\']+/BACKUPS' as backup target\.\nLoading XML file \"\./tests/rsync\.xml\"\.\nLoading XML schema \".*?backup\.xsd\"\.\nXML file \./tests/rsync\.xml is valid\.\nParsing XML element <Element {https://github\.com/jnphilipp/backup/}source at 0x[\w\d]+> for source\.\nParsing XML element <Element {https://github\.com/jnphilipp/backup/}source at 0x[\w\d]+> for source\.\nParsing XML element <Element {https://github\.com/jnphilipp/backup/}source at 0x[\w\d]+> for source\.\nParsing XML element <Element {https://github\.com/jnphilipp/backup/}source at 0x[\w\d]+> for source\.\nParsing XML element <Element {https://github\.com/jnphilipp/backup/}source at 0x[\w\d]+> for source\.\nLoading XML file \"tests/data\.xml\"\.\nParsing XML element <Element {https://github\.com/jnphilipp/backup/}source at 0x[\w\d]+> for source\.\nBacking up source /boot\.\nCommand: \"rsync\" \"--delete\" \"--delete-excluded\" \"--stats\" \"--backup-dir=.+?/BACKUPS/.+?/backup/boot\" \"-abuchvz\" \"/boot/\" \".+?/BACKUPS/.+?/files/boot\"\nEnv: None\nCwd: None\nBacking up source /etc\.\nCommand: \"rsync\" \"--delete\" \"--delete-excluded\" \"--stats\" \"--backup-dir=.+?/BACKUPS/.+?/backup/etc\" \"-abuchvz\" \"/etc/\" \".+?/BACKUPS/.+?/files/etc\"\nEnv: None\nCwd: None\nBacking up source /root\.\nCommand: \"rsync\" \"--delete\" \"--delete-excluded\" \"--stats\" \"--backup-dir=.+?/BACKUPS/.+?/backup/root\" \"-abuchvz\" \"--exclude=\*\*/\.cache\" \"--exclude=\*\*/\.dbus\" \"--exclude=\*\*/\.gvfs\" \"/root/\" \".+?/BACKUPS/.+?/files/root\"\nEnv: None\nCwd: None\nBacking up source /var\.\nCommand: \"rsync\" \"--delete\" \"--delete-excluded\" \"--stats\" \"--backup-dir=.+?/BACKUPS/.+?/backup/var\" \"-abuchvz\" \"--exclude=/crash\" \"--exclude=/tmp\" \"--exclude=/log\" \"--exclude=/spool\" \"/var/\" \".+?/BACKUPS/.+?/files/var\"\nEnv: None\nCwd: None\nBacking up source /srv\.\nCommand: \"rsync\" \"--delete\" \"--delete-excluded\" \"--stats\" \"--backup-dir=.+?/BACKUPS/.+?/backup/srv\" \"-abuchvz\" \"--exclude=\*\*/venv\" \"--exclude=\*\*/\.venv\" \"--exclude=\*\*/__pycache__\" \"--exclude=\*\*/\.mypy_cache\" \"/srv/\" \".+?/BACKUPS/.+?/files/srv\"\nEnv: None\nCwd: None\nBacking up source /run/media/DATA\.\nCommand: \"rsync\" \"--delete\" \"--delete-excluded\" \"--stats\" \"--backup-dir=.+?/BACKUPS/.+?/backup/run/media/DATA\" \"-abuchvz\" \"--exclude=/.Trash-1000\" \"/run/media/DATA/\" \".+?/BACKUPS/.+?/files/run/media/DATA\"\nEnv: None\nCwd: None\nDry run done\.\n",
                 stdout,
             )
         )
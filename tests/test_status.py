@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+# Copyright (C) 2019-2023 J. Nathanael Philipp (jnphilipp) <nathanael@philipp.land>
+# backup: Easily configure and reproducibly run complex backups.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import io
+import re
+import unittest
+
+from importlib.machinery import SourceFileLoader
+from importlib.util import module_from_spec, spec_from_loader
+from pathlib import Path
+from subprocess import Popen, PIPE
+from tempfile import TemporaryDirectory
+from threading import Barrier
+from time import sleep
+
+loader = SourceFileLoader("backup", "./backup")
+spec = spec_from_loader("backup", loader)
+assert spec is not None
+backup = module_from_spec(spec)
+loader.exec_module(backup)
+
+
+class StatusTests(unittest.TestCase):
+    def test_status(self):
+        with TemporaryDirectory() as target:
+            socket = str(Path(target) / "backup.sock")
+            backup = Popen(
+                ["./backup", "--status-socket", socket, "./tests/status.xml", target],
+                stdout=PIPE,
+                stderr=PIPE,
+                encoding="utf8",
+            )
+            sleep(1)
+
+            p = Popen(
+                ["./backup", "status", "--status-socket", socket],
+                stdout=PIPE,
+                stderr=PIPE,
+                encoding="utf8",
+            )
+            stdout, stderr = p.communicate()
+            self.assertEqual(p.returncode, 0)
+            self.assertIsNotNone(
+                re.fullmatch(
+                    r"Step 1: script-1, running for 0:00:0\d, 0:00:00 remaining\.\n"
+                    + r"0 jobs pending\.\n",
+                    stdout,
+                )
+            )
+            self.assertEqual(stderr, "")
+
+            stdout, stderr = backup.communicate()
+            self.assertEqual(backup.returncode, 0)
+            self.assertEqual(stdout, "")
+            self.assertEqual(stderr, "")
+            self.assertFalse(Path(socket).exists())
+
+            p = Popen(
+                ["./backup", "status", "--status-socket", socket],
+                stdout=PIPE,
+                stderr=PIPE,
+                encoding="utf8",
+            )
+            stdout, stderr = p.communicate()
+            self.assertEqual(p.returncode, 1)
+            self.assertEqual(stdout, "")
+            self.assertTrue(stderr.startswith(f"No running backup found on {socket}"))
+
+    def test_thread_logging(self):
+        lines = []
+        progress = []
+        backup.thread_logging(lines.append, progress=progress.append)(
+            io.TextIOWrapper(io.BytesIO(b"a\r b\r c\nd\r\ne\n"), newline="")
+        )
+        self.assertEqual(lines, [" c", "d", "e"])
+        self.assertEqual(progress, ["a", " b", " c", "d", "e"])
+
+        lines = []
+        backup.thread_logging(lines.append)(
+            io.TextIOWrapper(io.BytesIO(b"a\r b\nc\n"), newline="")
+        )
+        self.assertEqual(lines, ["a", " b", "c"])
+
+    def job_status(self, tool):
+        return backup.JobStatus(
+            backup.Job(
+                "source", "source /etc", "host/files/etc", Path("."), print, tool=tool
+            )
+        )
+
+    def test_progress_borg(self):
+        status = self.job_status(backup.Tool.BORG)
+        status.progress("A /etc/passwd")
+        status.progress("M /etc/group")
+        self.assertEqual(status.files, 2)
+        self.assertIsNone(status.bytes)
+        status.progress("1.23 MB O 456.78 kB C 123.45 kB D 42 N etc/hosts")
+        self.assertEqual(status.files, 42)
+        self.assertEqual(status.bytes, 1230000)
+        status.progress("Creating archive at ...")
+        self.assertEqual(status.files, 42)
+        self.assertEqual(status.bytes, 1230000)
+
+    def test_progress_duplicity(self):
+        status = self.job_status(backup.Tool.DUPLICITY)
+        status.progress("Local and Remote metadata are synchronized, no sync needed.")
+        self.assertIsNone(status.bytes)
+        status.progress("2.5MB 00:00:03 [1.2MB/s] [=====>     ] 50% ETA 3sec")
+        self.assertEqual(status.bytes, 2500000)
+        self.assertEqual(status.files, 0)
+
+    def test_progress_rsync(self):
+        status = self.job_status(backup.Tool.RSYNC)
+        status.progress("sending incremental file list")
+        self.assertIsNone(status.bytes)
+        status.progress(
+            "      1,234,567  45%   12.34MB/s    0:00:01 (xfr#12, to-chk=3/20)"
+        )
+        self.assertEqual(status.bytes, 1234567)
+        self.assertEqual(status.files, 12)
+        status.progress("         32.77K   0%    0.00kB/s    0:00:00")
+        self.assertEqual(status.bytes, 32770)
+        self.assertEqual(status.files, 12)
+
+    def test_progress_tar(self):
+        status = self.job_status(backup.Tool.TAR)
+        status.progress("/etc/")
+        status.progress("/etc/passwd")
+        status.progress("")
+        self.assertEqual(status.files, 2)
+        self.assertIsNone(status.bytes)
+
+    def test_shared_bytes(self):
+        with TemporaryDirectory() as target:
+            history = backup.History(Path(target))
+            barrier = Barrier(2)
+            jobs = [
+                backup.Job(
+                    "source",
+                    f"source /{name}",
+                    f"host/files/{name}",
+                    Path(target),
+                    lambda status: barrier.wait() is not None,
+                )
+                for name in ["etc", "srv"]
+            ]
+            status = backup.Status(history, jobs)
+            backup.run_jobs(jobs, status, 2)
+            self.assertIsNone(history.runs["host/files/etc"][0]["bytes"])
+            self.assertIsNone(history.runs["host/files/srv"][0]["bytes"])
+            self.assertIsNone(history.size("host/files/etc"))
+
+            jobs[0].run = lambda status: True
+            backup.run_jobs(jobs[:1], status)
+            self.assertIsNotNone(history.runs["host/files/etc"][1]["bytes"])
+            self.assertIsNotNone(history.size("host/files/etc"))
+
+    def test_failed_run(self):
+        with TemporaryDirectory() as target:
+            history = backup.History(Path(target))
+            jobs = [
+                backup.Job(
+                    "source",
+                    f"source /{name}",
+                    f"host/files/{name}",
+                    Path(target),
+                    lambda status, success=success: success,
+                )
+                for name, success in [("etc", False), ("srv", True)]
+            ]
+            backup.run_jobs(jobs, backup.Status(history, jobs))
+            self.assertNotIn("host/files/etc", history.runs)
+            self.assertIn("host/files/srv", history.runs)
+
+    def test_progress_tar_stderr(self):
+        with TemporaryDirectory() as tmpdir:
+            source = Path(tmpdir) / "source"
+            source.mkdir()
+            (source / "a").write_text("a")
+            (source / "b").write_text("b")
+            target = Path(tmpdir) / "target"
+            elem = backup.etree.fromstring(
+                f'<source xmlns="{backup.NAMESPACE["p"]}" name="host">'
+                + f"<path>{source}</path></source>"
+            )
+            job = backup.make_source_backup_function(
+                elem,
+                target,
+                (backup.Tool.TAR, ["--create", "--verbose"]),
+                None,
+                None,
+            )
+            status = backup.JobStatus(job)
+            with self.assertLogs(level="ERROR") as logs:
+                self.assertTrue(job.run(status))
+            self.assertEqual(
+                logs.output, ["ERROR:root:tar: Removing leading `/' from member names"]
+            )
+            self.assertEqual(status.files, 3)
+
+    def test_remaining(self):
+        with TemporaryDirectory() as target:
+            history = backup.History(Path(target))
+            jobs = []
+            for name, seconds in [("etc", 60), ("srv", 3600), ("boot", 10)]:
+                history.add(f"host/files/{name}", seconds, 0)
+                jobs.append(
+                    backup.Job(
+                        "source",
+                        f"source /{name}",
+                        f"host/files/{name}",
+                        Path(target),
+                        lambda status: True,
+                    )
+                )
+            jobs.append(
+                backup.Job(
+                    "MySQL",
+                    "MySQL database db",
+                    "host/db",
+                    Path(target),
+                    lambda status: True,
+                )
+            )
+            history.add("host/db", 30, 0)
+
+            self.assertEqual(backup.Status(history, jobs).snapshot()["remaining"], 3700)
+            self.assertEqual(
+                backup.Status(history, jobs, 2).snapshot()["remaining"], 3630
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
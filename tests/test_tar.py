@@ -18,9 +18,12 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import re
+import shutil
 import unittest
 
+from pathlib import Path
 from subprocess import Popen, PIPE
+from tempfile import TemporaryDirectory
 
 
 class TarBackupTests(unittest.TestCase):
@@ -114,7 +117,7 @@ class TarBackupTests(unittest.TestCase):
         self.assertEqual(p.returncode, 0)
         self.assertIsNotNone(
             re.fullmatch(
-                r"Using '[^\']+/BACKUPS' as backup target\.\nLoading XML file \"\./tests/tar\.xml\"\.\nLoading XML schema \".*?backup\.xsd\"\.\nXML file \./tests/tar\.xml is valid\.\nParsing XML element <Element {https://github\.com/jnphilipp/backup/}source at 0x[\w\d]+> for source.\nParsing XML element <Element {https://github\.com/jnphilipp/backup/}source at 0x[\w\d]+> for source\.\nParsing XML element <Element {https://github\.com/jnphilipp/backup/}source at 0x[\w\d]+> for source\.\nParsing XML element <Element {https://github\.com/jnphilipp/backup/}source at 0x[\w\d]+> for source\.\nParsing XML element <Element {https://github\.com/jnphilipp/backup/}source at 0x[\w\d]+> for source\.\nLoading XML file \"tests/data\.xml\"\.\nLoading XML schema \".*?backup\.xsd\"\.\nXML file tests/data\.xml is valid\.\nParsing XML element <Element {https://github\.com/jnphilipp/backup/}source at 0x[\w\d]+> for source\.\nBacking up source /boot\.\nCommand: \"tar\" \"--create\" \"--gzip\" \"--listed-incremental=.+?/BACKUPS/.+?/files/boot/boot\.snapshot\" \"--verbose\" \"--file\" \".+?/BACKUPS/.+?/files/boot/boot\.0\.tar\.gz\" \"/boot\"\nEnv: None\nCwd: None\nBacking up source /etc\.\nCommand: \"tar\" \"--create\" \"--gzip\" \"--listed-incremental=.+?/BACKUPS/.+?/files/etc/etc\.snapshot\" \"--verbose\" \"--file\" \".+?/BACKUPS/.+?/files/etc/etc\.0\.tar\.gz\" \"/etc\"\nEnv: None\nCwd: None\nBacking up source /root\.\nCommand: \"tar\" \"--create\" \"--gzip\" \"--listed-incremental=.+?/BACKUPS/.+?/files/root/root\.snapshot\" \"--verbose\" \"--exclude=\*\*/\.cache\" \"--exclude=\*\*/\.dbus\" \"--exclude=\*\*/\.gvfs\" \"--file\" \".+?/BACKUPS/.+?/files/root/root\.0\.tar\.gz\" \"/root\"\nEnv: None\nCwd: None\nBacking up source /var\.\nCommand: \"tar\" \"--create\" \"--gzip\" \"--listed-incremental=.+?/BACKUPS/.+?/files/var/var\.snapshot\" \"--verbose\" \"--exclude=/crash\" \"--exclude=/tmp\" \"--exclude=/log\" \"--exclude=/spool\" \"--file\" \".+?/BACKUPS/.+?/files/var/var\.0\.tar\.gz\" \"/var\"\nEnv: None\nCwd: None\nBacking up source /srv\.\nCommand: \"tar\" \"--create\" \"--gzip\" \"--listed-incremental=.+?/BACKUPS/.+?/files/srv/srv\.snapshot\" \"--verbose\" \"--exclude=\*\*/venv\" \"--exclude=\*\*/\.venv\" \"--exclude=\*\*/__pycache__\" \"--exclude=\*\*/\.mypy_cache\" \"--file\" \".+?/BACKUPS/.+?/files/srv/srv\.0\.tar\.gz\" \"/srv\"\nEnv: None\nCwd: None\nBacking up source /run/media/DATA\.\nCommand: \"tar\" \"--create\" \"--gzip\" \"--listed-incremental=.+?/BACKUPS/.+?/files/run/media/DATA/DATA\.snapshot\" \"--verbose\" \"--exclude=/\.Trash-1000\" \"--file\" \".+?/BACKUPS/.+?/files/run/media/DATA/DATA\.0\.tar\.gz\" \"/run/media/DATA\"\nEnv: None\nCwd: None\nDry run done\.\n",
+                r"Using '[^\']+/BACKUPS' as backup target\.\nLoading XML file \"\./tests/tar\.xml\"\.\nLoading XML schema \".*?backup\.xsd\"\.\nXML file \./tests/tar\.xml is valid\.\nParsing XML element <Element {https://github\.com/jnphilipp/backup/}source at 0x[\w\d]+> for source.\nParsing XML element <Element {https://github\.com/jnphilipp/backup/}source at 0x[\w\d]+> for source\.\nParsing XML element <Element {https://github\.com/jnphilipp/backup/}source at 0x[\w\d]+> for source\.\nParsing XML element <Element {https://github\.com/jnphilipp/backup/}source at 0x[\w\d]+> for source\.\nParsing XML element <Element {https://github\.com/jnphilipp/backup/}source at 0x[\w\d]+> for source\.\nLoading XML file \"tests/data\.xml\"\.\nParsing XML element <Element {https://github\.com/jnphilipp/backup/}source at 0x[\w\d]+> for source\.\nBacking up source /boot\.\nCommand: \"tar\" \"--create\" \"--gzip\" \"--listed-incremental=.+?/BACKUPS/.+?/files/boot/boot\.snapshot\" \"--verbose\" \"--file\" \".+?/BACKUPS/.+?/files/boot/boot\.0\.tar\.gz\" \"/boot\"\nEnv: None\nCwd: None\nBacking up source /etc\.\nCommand: \"tar\" \"--create\" \"--gzip\" \"--listed-incremental=.+?/BACKUPS/.+?/files/etc/etc\.snapshot\" \"--verbose\" \"--file\" \".+?/BACKUPS/.+?/files/etc/etc\.0\.tar\.gz\" \"/etc\"\nEnv: None\nCwd: None\nBacking up source /root\.\nCommand: \"tar\" \"--create\" \"--gzip\" \"--listed-incremental=.+?/BACKUPS/.+?/files/root/root\.snapshot\" \"--verbose\" \"--exclude=\*\*/\.cache\" \"--exclude=\*\*/\.dbus\" \"--exclude=\*\*/\.gvfs\" \"--file\" \".+?/BACKUPS/.+?/files/root/root\.0\.tar\.gz\" \"/root\"\nEnv: None\nCwd: None\nBacking up source /var\.\nCommand: \"tar\" \"--create\" \"--gzip\" \"--listed-incremental=.+?/BACKUPS/.+?/files/var/var\.snapshot\" \"--verbose\" \"--exclude=/crash\" \"--exclude=/tmp\" \"--exclude=/log\" \"--exclude=/spool\" \"--file\" \".+?/BACKUPS/.+?/files/var/var\.0\.tar\.gz\" \"/var\"\nEnv: None\nCwd: None\nBacking up source /srv\.\nCommand: \"tar\" \"--create\" \"--gzip\" \"--listed-incremental=.+?/BACKUPS/.+?/files/srv/srv\.snapshot\" \"--verbose\" \"--exclude=\*\*/venv\" \"--exclude=\*\*/\.venv\" \"--exclude=\*\*/__pycache__\" \"--exclude=\*\*/\.mypy_cache\" \"--file\" \".+?/BACKUPS/.+?/files/srv/srv\.0\.tar\.gz\" \"/srv\"\nEnv: None\nCwd: None\nBacking up source /run/media/DATA\.\nCommand: \"tar\" \"--create\" \"--gzip\" \"--listed-incremental=.+?/BACKUPS/.+?/files/run/media/DATA/DATA\.snapshot\" \"--verbose\" \"--exclude=/\.Trash-1000\" \"--file\" \".+?/BACKUPS/.+?/files/run/media/DATA/DATA\.0\.tar\.gz\" \"/run/media/DATA\"\nEnv: None\nCwd: None\nDry run done\.\n",
                 stdout,
             )
         )
@@ -124,6 +127,113 @@ class TarBackupTests(unittest.TestCase):
             stderr,
         )
 
+    def test_compression(self):
+        p = Popen(
+            [
+                "./backup",
+                "--dry-run",
+                "-vvv",
+                "./tests/tar-compression.xml",
+                "./BACKUPS",
+            ],
+            stdout=PIPE,
+            stderr=PIPE,
+            encoding="utf8",
+        )
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 0)
+        self.assertIsNotNone(
+            re.fullmatch(
+                r"Using '[^\']+/BACKUPS' as backup target\.\nLoading XML file \"\./tests/tar-compression\.xml\"\.\nLoading XML schema \".*?backup\.xsd\"\.\nXML file \./tests/tar-compression\.xml is valid\.\nParsing XML element <Element {https://github\.com/jnphilipp/backup/}source at 0x[\w\d]+> for source\.\nParsing XML element <Element {https://github\.com/jnphilipp/backup/}source at 0x[\w\d]+> for source\.\nBacking up source /etc\.\nCommand: \"tar\" \"--create\" \"--listed-incremental=.+?/BACKUPS/.+?/files/etc/etc\.snapshot\" \"--verbose\" \"--use-compress-program=zstd -T4 -3\" \"--file\" \".+?/BACKUPS/.+?/files/etc/etc\.0\.tar\.zst\" \"/etc\"\nEnv: None\nCwd: None\nBacking up source /srv\.\nCommand: \"tar\" \"--create\" \"--listed-incremental=.+?/BACKUPS/.+?/files/srv/srv\.snapshot\" \"--verbose\" \"--use-compress-program=zstd -T4 -3\" \"--exclude=\*\*/__pycache__\" \"--file\" \".+?/BACKUPS/.+?/files/srv/srv\.0\.tar\.zst\" \"/srv\"\nEnv: None\nCwd: None\nDry run done\.\n",
+                stdout,
+            )
+        )
+        self.assertEqual(
+            "[WARNING] Performing dry run, no changes will be done.\n[WARNING] The "
+            + "given target path does not exists.\n",
+            stderr,
+        )
+
+        p = Popen(
+            [
+                "./backup",
+                "--dry-run",
+                "./tests/tar-compression-invalid.xml",
+                "./BACKUPS",
+            ],
+            stdout=PIPE,
+            stderr=PIPE,
+            encoding="utf8",
+        )
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 1)
+        self.assertEqual(stdout, "")
+        self.assertEqual(
+            "[WARNING] Performing dry run, no changes will be done.\n[WARNING] The "
+            + "given target path does not exists.\n[CRITICAL] XML file "
+            + "./tests/tar-compression-invalid.xml is not valid.\n[CRITICAL] "
+            + "Compression zstd is configured, but tar already compresses with "
+            + "--gzip.\n",
+            stderr,
+        )
+
+        p = Popen(
+            ["./backup", "--is-valid", "./tests/tar-compression-invalid.xml"],
+            stdout=PIPE,
+            stderr=PIPE,
+            encoding="utf8",
+        )
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 1)
+        self.assertEqual(stdout, "")
+        self.assertEqual(
+            "[CRITICAL] XML file ./tests/tar-compression-invalid.xml is not valid.\n"
+            + "[CRITICAL] Compression zstd is configured, but tar already compresses "
+            + "with --gzip.\n",
+            stderr,
+        )
+
+        p = Popen(
+            ["./backup", "--is-valid", "./tests/tar-compression-level.xml"],
+            stdout=PIPE,
+            stderr=PIPE,
+            encoding="utf8",
+        )
+        stdout, stderr = p.communicate()
+        self.assertEqual(p.returncode, 1)
+        self.assertEqual(stdout, "")
+        self.assertEqual(
+            "[CRITICAL] XML file ./tests/tar-compression-level.xml is not valid.\n"
+            + "[CRITICAL] Compression level 20 is not supported by zstd, use 1 to 19."
+            + "\n",
+            stderr,
+        )
+
+    @unittest.skipIf(shutil.which("pigz") is not None, "pigz is installed")
+    def test_compression_missing(self):
+        with TemporaryDirectory() as target:
+            config = Path(target) / "backup.xml"
+            with open("./tests/tar-compression.xml", encoding="utf8") as f:
+                config.write_text(
+                    f.read().replace('compression="zstd"', 'compression="gzip"'),
+                    encoding="utf8",
+                )
+
+            p = Popen(
+                ["./backup", str(config), target],
+                stdout=PIPE,
+                stderr=PIPE,
+                encoding="utf8",
+            )
+            stdout, stderr = p.communicate()
+            self.assertEqual(p.returncode, 1)
+            self.assertEqual(stdout, "")
+            self.assertEqual(
+                "[CRITICAL] Compression gzip is configured, but pigz is not "
+                + "installed.\n",
+                stderr,
+            )
+
 
 if __name__ == "__main__":
     unittest.main()